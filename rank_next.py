@@ -1,11 +1,19 @@
+import argparse
+import bisect
 import csv
+import math
+import sys
+from datetime import datetime, timedelta
 from collections import defaultdict
 from pathlib import Path
+import hashlib
 import json
 
 
 UNLOCKED_PATH = Path("data/unlocked.csv")
 LOCKED_PATH   = Path("data/locked.csv")
+GAME_DETAILS_DIR = Path("game_details")
+PROGRESS_HISTORY_PATH = Path("data/progress_history.jsonl")
 
 
 # ====== SETTINGS YOU CAN TWEAK ======
@@ -13,6 +21,18 @@ INCLUDE_DLC = True                 # If False, ignore DLC achievements entirely
 COUNT_UNACHIEVABLE_IN_TOTAL = True # If False, unachievable locked achs won't count against completion %
 # ===================================
 
+# Along with self unachievable games i am also going to manually enter some
+# here as they are discontinued hence can't be bought and completed anymore
+DELISTED_GAMES = {"Besiege (Windows)", "Second Extinction"}
+
+UNLOCKED_REQUIRED = {"GameName","Gamerscore","TAScore","TARatio","DLCName","UnlockDate"}
+LOCKED_REQUIRED   = {"GameName","Gamerscore","TAScore","TARatio","DLCName","Unachieveable"}
+
+def resolve_settings(include_dlc=None, count_unachievable=None):
+    """Fill unset (None) settings from the module defaults above."""
+    return (INCLUDE_DLC if include_dlc is None else include_dlc,
+            COUNT_UNACHIEVABLE_IN_TOTAL if count_unachievable is None else count_unachievable)
+
 def safe_int(x, default=0):
     try:
         return int(str(x).replace(",", "").strip())
@@ -34,26 +54,456 @@ def is_truthy(x: str) -> bool:
     return s in ("1", "true", "yes", "y", "t")
 
 
+class RatioStats:
+    """Constant-memory running stats for TA ratios.
+
+    Keeps count, sum, Welford mean/variance and min/max, plus a log-bucketed
+    quantile sketch (relative error ~RELATIVE_ACCURACY) so medians and p90s can
+    be read without holding on to every ratio. Two instances can be merged,
+    which is how per-DLC and profile-wide stats are built from per-game ones.
+    """
+
+    RELATIVE_ACCURACY = 0.01
+    _GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+    _LOG_GAMMA = math.log(_GAMMA)
+
+    __slots__ = ("count", "total", "mean", "_m2", "min", "max", "_buckets", "_zero_count")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = None
+        self.max = None
+        self._buckets = {}      # sketch bucket index -> count
+        self._zero_count = 0    # ratios <= 0 can't be log-bucketed
+
+    def add(self, x):
+        x = float(x)
+        self.count += 1
+        self.total += x
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (x - self.mean)
+        if self.min is None or x < self.min:
+            self.min = x
+        if self.max is None or x > self.max:
+            self.max = x
+
+        if x <= 0:
+            self._zero_count += 1
+        else:
+            key = math.ceil(math.log(x) / self._LOG_GAMMA)
+            self._buckets[key] = self._buckets.get(key, 0) + 1
+
+    def merge(self, other):
+        """Fold another RatioStats into this one (Chan et al. parallel variance)."""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.mean = other.mean
+            self._m2 = other._m2
+        else:
+            n = self.count + other.count
+            delta = other.mean - self.mean
+            self.mean += delta * other.count / n
+            self._m2 += other._m2 + delta * delta * self.count * other.count / n
+        self.count += other.count
+        self.total += other.total
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        self._zero_count += other._zero_count
+        for key, cnt in other._buckets.items():
+            self._buckets[key] = self._buckets.get(key, 0) + cnt
+        return self
+
+    @classmethod
+    def combined(cls, *parts):
+        """Return a new RatioStats holding the union of ``parts``."""
+        out = cls()
+        for p in parts:
+            out.merge(p)
+        return out
+
+    def average(self):
+        return self.mean if self.count else None
+
+    def variance(self):
+        # Population variance, matching how the averages are computed
+        return (self._m2 / self.count) if self.count else None
+
+    def stdev(self):
+        var = self.variance()
+        return math.sqrt(var) if var is not None else None
+
+    def quantile(self, q):
+        """Approximate q-quantile (0..1) from the sketch, or None if empty."""
+        if self.count == 0:
+            return None
+        rank = int(q * (self.count - 1) + 0.5)  # nearest-rank
+        seen = self._zero_count
+        if rank < seen:
+            return self.min
+        value = self.max
+        for key in sorted(self._buckets):
+            seen += self._buckets[key]
+            if rank < seen:
+                value = 2 * (self._GAMMA ** key) / (self._GAMMA + 1)
+                break
+        return min(max(value, self.min), self.max)
+
+    def median(self):
+        return self.quantile(0.5)
+
+    def p90(self):
+        return self.quantile(0.9)
+
+    def summary(self):
+        """JSON-friendly summary for the exports."""
+        return {
+            "count": self.count,
+            "mean": self.average(),
+            "stdev": self.stdev(),
+            "min": self.min,
+            "max": self.max,
+            "median": self.median(),
+            "p90": self.p90()
+        }
+
+
+DAY_FIRST_FORMATS = ("%d/%m/%Y %H:%M:%S", "%d/%m/%Y %H:%M", "%d/%m/%Y")
+MONTH_FIRST_FORMATS = ("%m/%d/%Y %H:%M:%S", "%m/%d/%Y %H:%M", "%m/%d/%Y")
+UNLOCK_DATE_FORMATS = (
+    ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d")
+    + DAY_FIRST_FORMATS + MONTH_FIRST_FORMATS
+    + ("%d %b %Y %H:%M", "%d %b %Y", "%d %B %Y %H:%M", "%d %B %Y")
+)
+ISO_FORMAT = "iso"  # datetime.fromisoformat, tried before UNLOCK_DATE_FORMATS
+
+
+def _slash_order(s):
+    """True for an unambiguous dd/mm date, False for mm/dd, None otherwise."""
+    parts = str(s or "").strip().split(" ")[0].split("/")
+    if len(parts) != 3 or not (parts[0].isdigit() and parts[1].isdigit()):
+        return None
+    first, second = int(parts[0]), int(parts[1])
+    if first > 12 and second <= 12:
+        return True
+    if second > 12 and first <= 12:
+        return False
+    return None
+
+
+class UnlockDateParser:
+    """Parses one export's UnlockDate values into 'YYYY-MM-DD' day strings.
+
+    Whether dd/mm or mm/dd comes first is decided once per export from the
+    first unambiguous value in ``values`` (day first if there is none), so
+    an ambiguous date reads the same wherever it appears in the export.
+    Non-empty values that match no format are counted in ``skipped``.
+    """
+
+    def __init__(self, values=()):
+        self.format = None
+        self.skipped = 0
+        self.day_first = True
+        for v in values:
+            order = _slash_order(v)
+            if order is not None:
+                self.day_first = order
+                break
+        # The other order still reads values that are unambiguous in it
+        other = MONTH_FIRST_FORMATS if self.day_first else DAY_FIRST_FORMATS
+        self._other = set(other)
+        self._formats = (ISO_FORMAT,) + tuple(f for f in UNLOCK_DATE_FORMATS if f not in other) + other
+
+    @staticmethod
+    def _try(s, fmt):
+        try:
+            if fmt == ISO_FORMAT:
+                # fromisoformat doesn't accept a trailing Z before Python 3.11
+                return datetime.fromisoformat(s[:-1] + "+00:00" if s.endswith("Z") else s)
+            return datetime.strptime(s, fmt)
+        except ValueError:
+            return None
+
+    def parse(self, x):
+        s = str(x or "").strip()
+        if not s:
+            return None
+        formats = self._formats
+        if self.format is not None:
+            formats = (self.format,) + formats
+        for fmt in formats:
+            dt = self._try(s, fmt)
+            if dt is not None:
+                # An export keeps one format, so try the last match first
+                if fmt not in self._other:
+                    self.format = fmt
+                return dt.strftime("%Y-%m-%d")
+        self.skipped += 1
+        return None
+
+def parse_unlock_day(x):
+    """Parse a single UnlockDate value into a 'YYYY-MM-DD' day string (or None)."""
+    return UnlockDateParser([x]).parse(x)
+
+
+def unlock_events(unlocked_rows):
+    """Yield (day, game, gs, ta) for each unlocked row; day is None if unparseable.
+
+    Rows without an UnlockDate aren't unlocks (see read_unlocked) and are skipped.
+    The dates are scanned once up front to pick dd/mm or mm/dd (see UnlockDateParser).
+    """
+    unlocked_rows = list(unlocked_rows)
+    parser = UnlockDateParser(r.get("UnlockDate") for r in unlocked_rows)
+    for r in unlocked_rows:
+        if not str(r.get("UnlockDate","")).strip():
+            continue
+        yield (parser.parse(r.get("UnlockDate")), (r.get("GameName") or "").strip(),
+               safe_int(r.get("Gamerscore", 0)), safe_int(r.get("TAScore", 0)))
+
+
+class ProgressHistory:
+    """Day-level rollups of unlocked GS/TA/achievement counts, overall and per game.
+
+    Persisted as an append-only JSON Lines file: one line per day, and a later
+    line for the same day replaces an earlier one when loading (an entry with
+    no unlocks removes the day). Each export re-rolls the last REROLL_DAYS
+    days up to the last stored day, so late-syncing unlocks and corrected
+    dates in that window are picked up, and appends the days that changed.
+    Days before the window are treated as final.
+    """
+
+    REROLL_DAYS = 30
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.skipped = 0  # unlocks left out of the last update (unparseable UnlockDate)
+        self.late = 0     # unlocks left out of the last update (dated before the re-rolled window)
+        self.days = {}  # "YYYY-MM-DD" -> {"gs", "ta", "ach", "games": {game: [gs, ta, ach]}}
+        if path.exists():
+            with path.open("r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        entry = json.loads(line)
+                        day = entry.pop("day")
+                        if entry["ach"]:
+                            self.days[day] = entry
+                        else:
+                            self.days.pop(day, None)
+
+    def last_day(self):
+        return max(self.days) if self.days else None
+
+    def update(self, unlocked_rows):
+        """Roll up new unlocks and append changed days to the store.
+
+        Returns the number of day entries appended.
+        """
+        return self.update_events(unlock_events(unlocked_rows))
+
+    def update_events(self, events):
+        """Like update(), but from (day, game, gs, ta) tuples (see unlock_events).
+
+        Events with no day are counted in ``skipped`` instead of rolled up.
+        Events before the re-rolled window that the stored days don't account
+        for are counted in ``late``.
+        """
+        cutoff = self.last_day()
+        if cutoff is not None:
+            cutoff = (datetime.strptime(cutoff, "%Y-%m-%d") - timedelta(days=self.REROLL_DAYS)).strftime("%Y-%m-%d")
+        fresh = {}
+        older = defaultdict(int)  # day -> unlocks before the window
+        self.skipped = 0
+        for day, game, gs, ta in events:
+            if day is None:
+                self.skipped += 1
+                continue
+            if cutoff is not None and day < cutoff:
+                older[day] += 1
+                continue
+
+            entry = fresh.setdefault(day, {"gs": 0, "ta": 0, "ach": 0, "games": {}})
+            entry["gs"] += gs
+            entry["ta"] += ta
+            entry["ach"] += 1
+            per_game = entry["games"].setdefault(game, [0, 0, 0])
+            per_game[0] += gs
+            per_game[1] += ta
+            per_game[2] += 1
+
+        self.late = sum(max(0, n - self.days.get(day, {}).get("ach", 0)) for day, n in older.items())
+
+        # Days in the window that no longer have any unlocks (e.g. a corrected date)
+        for day in self.days:
+            if (cutoff is None or day >= cutoff) and day not in fresh:
+                fresh[day] = {"gs": 0, "ta": 0, "ach": 0, "games": {}}
+
+        changed = [day for day in sorted(fresh) if self.days.get(day) != fresh[day]]
+        if changed:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as f:
+                for day in changed:
+                    if fresh[day]["ach"]:
+                        self.days[day] = fresh[day]
+                    else:
+                        del self.days[day]
+                    line = dict(fresh[day], day=day)
+                    f.write(json.dumps(line, ensure_ascii=False, sort_keys=True) + "\n")
+        return len(changed)
+
+    def daily_series(self):
+        """Parallel arrays of per-day totals, oldest first."""
+        days = sorted(self.days)
+        return {
+            "days": days,
+            "gs": [self.days[d]["gs"] for d in days],
+            "ta": [self.days[d]["ta"] for d in days],
+            "ach": [self.days[d]["ach"] for d in days]
+        }
+
+    def monthly_series(self):
+        """Parallel arrays of per-month totals, oldest first."""
+        months = defaultdict(lambda: [0, 0, 0])
+        for day, entry in self.days.items():
+            m = months[day[:7]]
+            m[0] += entry["gs"]
+            m[1] += entry["ta"]
+            m[2] += entry["ach"]
+        return _series_from_months(months)
+
+    def monthly_by_game(self):
+        """{game: monthly parallel arrays} for the per-game drill-down."""
+        per_game = defaultdict(lambda: defaultdict(lambda: [0, 0, 0]))
+        for day, entry in self.days.items():
+            for game, (gs, ta, ach) in entry["games"].items():
+                m = per_game[game][day[:7]]
+                m[0] += gs
+                m[1] += ta
+                m[2] += ach
+        return {game: _series_from_months(months) for game, months in per_game.items()}
+
+def _series_from_months(months):
+    keys = sorted(months)
+    return {
+        "months": keys,
+        "gs": [months[k][0] for k in keys],
+        "ta": [months[k][1] for k in keys],
+        "ach": [months[k][2] for k in keys]
+    }
+
+
+def _read_csv(f, required: set, name: str):
+    reader = csv.DictReader(f)
+    # Text streams opened without utf-8-sig keep the BOM on the first header
+    if reader.fieldnames and reader.fieldnames[0].startswith("\ufeff"):
+        reader.fieldnames[0] = reader.fieldnames[0].lstrip("\ufeff")
+    missing = required - set(reader.fieldnames or [])
+    if missing:
+        raise ValueError(f"{name} CSV missing columns: {missing}. Found: {reader.fieldnames}")
+    return list(reader)
+
 def load_csv(path: Path, required: set):
     """Load a CSV file and validate required headers.
 
     Returns a list of rows (dicts).
     """
     with path.open("r", encoding="utf-8-sig", newline="") as f:
-        reader = csv.DictReader(f)
-        missing = required - set(reader.fieldnames or [])
+        return _read_csv(f, required, path.name)
+
+def load_rows(source, required: set, name: str):
+    """Load export rows from a path, an open text file or an iterable of dicts.
+
+    Returns a list of rows (dicts), validated like load_csv.
+    """
+    if isinstance(source, (str, Path)):
+        return load_csv(Path(source), required)
+    if hasattr(source, "read"):
+        return _read_csv(source, required, getattr(source, "name", name))
+    rows = list(source)
+    if rows:
+        missing = required - set(rows[0])
         if missing:
-            raise ValueError(f"{path.name} CSV missing columns: {missing}. Found: {reader.fieldnames}")
-        return list(reader)
+            raise ValueError(f"{name} rows missing columns: {missing}. Found: {list(rows[0])}")
+    return rows
+
+def new_games():
+    """Empty per-game aggregate table, filled by read_unlocked/read_locked."""
+    return defaultdict(lambda: {
+        "earned_ach": 0, "earned_gs": 0, "earned_ta": 0,
+        "earned_dlc_ach": 0,
+        "locked_ach_total": 0, "locked_gs_total": 0, "locked_ta_total": 0,
+        "locked_dlc_ach": 0,
+        "locked_ach_unach": 0, "locked_gs_unach": 0, "locked_ta_unach": 0,
+        "locked_dlc_unach": 0,
+        "earned_ratio_stats": RatioStats(),
+        "locked_ratio_stats": RatioStats()
+    })
+
+def _row_title(r):
+    # try to find a title field
+    for k in ("AchievementName", "AchievementTitle", "Name", "Title"):
+        if k in r and str(r.get(k)).strip():
+            return str(r.get(k)).strip()
+    return None
+
+def add_unlocked(games, game, dlc_name, gs, ta, ratio, title, row=None, listing=True):
+    """Add one unlocked achievement to the per-game aggregates.
+
+    With ``listing`` False only the counters are updated, not the per-achievement list.
+    """
+    g = games[game]
+    g["earned_ach"] += 1
+    g["earned_gs"] += gs
+    g["earned_ta"] += ta
+    if dlc_name:
+        g["earned_dlc_ach"] += 1
+
+    # Track ratios (optional)
+    if ratio is not None:
+        g["earned_ratio_stats"].add(ratio)
+    # store row for listing
+    if listing:
+        g.setdefault("earned_achievements", []).append({"ratio": ratio, "gamerscore": gs, "ta": ta, "dlc": dlc_name, "title": title, "row": row})
+
+def add_locked(games, game, dlc_name, gs, ta, ratio, title, unach, row=None, listing=True):
+    """Add one locked achievement to the per-game aggregates (``listing`` as add_unlocked)."""
+    g = games[game]
+    g["locked_ach_total"] += 1
+    g["locked_gs_total"] += gs
+    g["locked_ta_total"] += ta
+    if dlc_name:
+        g["locked_dlc_ach"] += 1
 
-def read_unlocked(games):
-    required = {"GameName","Gamerscore","TAScore","TARatio","DLCName","UnlockDate"}
-    rows = load_csv(UNLOCKED_PATH, required)
+    if unach:
+        g["locked_ach_unach"] += 1
+        g["locked_gs_unach"] += gs
+        g["locked_ta_unach"] += ta
+        if dlc_name:
+            g["locked_dlc_unach"] += 1
+
+    # Ratio opportunity: only consider achievable locked achievements
+    if (not unach) and ratio is not None:
+        g["locked_ratio_stats"].add(ratio)
+    # store locked achievement row (mark unachievable)
+    if not listing:
+        return
+    g.setdefault("locked_achievements_all", []).append({"ratio": ratio, "gamerscore": gs, "ta": ta, "dlc": dlc_name, "title": title, "unachievable": unach, "row": row})
+    if not unach:
+        g.setdefault("locked_achievements_achievable", []).append({"ratio": ratio, "gamerscore": gs, "ta": ta, "dlc": dlc_name, "title": title, "row": row})
+
+def read_unlocked(games, rows=None, include_dlc=None):
+    include_dlc, _ = resolve_settings(include_dlc)
+    if rows is None:
+        rows = load_csv(UNLOCKED_PATH, UNLOCKED_REQUIRED)
 
     for r in rows:
         game = (r.get("GameName") or "").strip()
         dlc_name = (r.get("DLCName") or "").strip()
-        if (not INCLUDE_DLC) and dlc_name:
+        if (not include_dlc) and dlc_name:
             continue
 
         gs = safe_int(r.get("Gamerscore", 0))
@@ -64,84 +514,41 @@ def read_unlocked(games):
         if not str(r.get("UnlockDate","")).strip():
             continue
 
-        g = games[game]
-        g["earned_ach"] += 1
-        g["earned_gs"] += gs
-        g["earned_ta"] += ta
-        if dlc_name:
-            g["earned_dlc_ach"] += 1
-
-        # Track ratios (optional)
-        if ratio is not None:
-            g["earned_ratios"].append(ratio)
-        # store row for listing (try to find a title field)
-        title = None
-        for k in ("AchievementName", "AchievementTitle", "Name", "Title"):
-            if k in r and str(r.get(k)).strip():
-                title = str(r.get(k)).strip()
-                break
-        g.setdefault("earned_achievements", []).append({"ratio": ratio, "gamerscore": gs, "ta": ta, "dlc": dlc_name, "title": title, "row": r})
+        add_unlocked(games, game, dlc_name, gs, ta, ratio, _row_title(r), r)
 
-def read_locked(games):
-    required = {"GameName","Gamerscore","TAScore","TARatio","DLCName","Unachieveable"}
-    rows = load_csv(LOCKED_PATH, required)
+def read_locked(games, rows=None, include_dlc=None):
+    include_dlc, _ = resolve_settings(include_dlc)
+    if rows is None:
+        rows = load_csv(LOCKED_PATH, LOCKED_REQUIRED)
 
     for r in rows:
         game = (r.get("GameName") or "").strip()
         dlc_name = (r.get("DLCName") or "").strip()
-        if (not INCLUDE_DLC) and dlc_name:
+        if (not include_dlc) and dlc_name:
             continue
 
         gs = safe_int(r.get("Gamerscore", 0))
         ta = safe_int(r.get("TAScore", 0))
         ratio = safe_float(r.get("TARatio"))
 
-        '''
-        Along with self unachievable games i am also going to manually enter some 
-        here as they are discontinued hence can't be bought and completed anymore
-        '''
-        unach = is_truthy(r.get("Unachieveable","")) or (game == "Besiege (Windows)" )or (game == "Second Extinction")
+        # Delisted games (see DELISTED_GAMES) count as unachievable too
+        unach = is_truthy(r.get("Unachieveable","")) or (game in DELISTED_GAMES)
 
-        g = games[game]
-        g["locked_ach_total"] += 1
-        g["locked_gs_total"] += gs
-        g["locked_ta_total"] += ta
-        if dlc_name:
-            g["locked_dlc_ach"] += 1
-
-        '''
-        Along with self unachievable games i am also going to manually enter some here as they are discontinued
-        '''
-        if unach:
-            g["locked_ach_unach"] += 1
-            g["locked_gs_unach"] += gs
-            g["locked_ta_unach"] += ta
-            if dlc_name:
-                g["locked_dlc_unach"] += 1
-
-        # Ratio opportunity: only consider achievable locked achievements
-        if (not unach) and ratio is not None:
-            g["locked_ratios_achievable"].append(ratio)
-        # store locked achievement row (mark unachievable)
-        title = None
-        for k in ("AchievementName", "AchievementTitle", "Name", "Title"):
-            if k in r and str(r.get(k)).strip():
-                title = str(r.get(k)).strip()
-                break
-        g.setdefault("locked_achievements_all", []).append({"ratio": ratio, "gamerscore": gs, "ta": ta, "dlc": dlc_name, "title": title, "unachievable": unach, "row": r})
-        if not unach:
-            g.setdefault("locked_achievements_achievable", []).append({"ratio": ratio, "gamerscore": gs, "ta": ta, "dlc": dlc_name, "title": title, "row": r})
+        add_locked(games, game, dlc_name, gs, ta, ratio, _row_title(r), unach, r)
 
-def get_game_info(game, g):
+def get_game_info(game, g, count_unachievable=None):
     """Extract game information for ranking. Games are ranked by number of remaining achievements (ascending)."""
+    _, count_unachievable = resolve_settings(count_unachievable=count_unachievable)
     # Totals: earned + locked, optionally excluding unachievable
-    # Compute remaining achievements/GS according to COUNT_UNACHIEVABLE_IN_TOTAL
+    # Compute remaining achievements/GS according to count_unachievable
     locked_ach_effective = g["locked_ach_total"]
     locked_gs_effective  = g["locked_gs_total"]
+    locked_ta_effective  = g["locked_ta_total"]
 
-    if not COUNT_UNACHIEVABLE_IN_TOTAL:
+    if not count_unachievable:
         locked_ach_effective -= g["locked_ach_unach"]
         locked_gs_effective  -= g["locked_gs_unach"]
+        locked_ta_effective  -= g["locked_ta_unach"]
 
     # For completion percentage, always include unachievable locked GS as part
     # of the game's total (they are still a portion of the game's GS even if
@@ -155,23 +562,30 @@ def get_game_info(game, g):
     completion = g["earned_gs"] / total_gs_for_completion  # 0..1
     remaining_ach = max(0, locked_ach_effective)
     remaining_gs  = max(0, locked_gs_effective)
+    remaining_ta  = max(0, locked_ta_effective)
 
     # ✅ Don't recommend already-finished games
     if remaining_ach == 0:
         return None
 
     # Compute average locked TARatio for achievable locked achievements (for display only)
-    ratios = g.get("locked_ratios_achievable", [])
-    avg_ratio = (sum(ratios) / len(ratios)) if ratios else None
+    ratio_stats = g["locked_ratio_stats"]
 
     return {
         "game": game,
         "completion": completion,
         "remaining_ach": remaining_ach,
         "remaining_gs": remaining_gs,
+        "remaining_ta": remaining_ta,
+        # What can actually still be earned, whatever count_unachievable says
+        "achievable_ach": max(0, g["locked_ach_total"] - g["locked_ach_unach"]),
+        "achievable_gs": max(0, g["locked_gs_total"] - g["locked_gs_unach"]),
+        "achievable_ta": max(0, g["locked_ta_total"] - g["locked_ta_unach"]),
         "unach_ach": g["locked_ach_unach"],
         "dlc_remaining": g["locked_dlc_ach"],
-        "avg_locked_ratio": avg_ratio,
+        "avg_locked_ratio": ratio_stats.average(),
+        "median_locked_ratio": ratio_stats.median(),
+        "p90_locked_ratio": ratio_stats.p90(),
         "earned_ach": g["earned_ach"],
         "total_ach": total_ach,
         "earned_gs": g["earned_gs"],
@@ -182,11 +596,244 @@ def get_game_info(game, g):
 
 
 
+class CompletionPlanner:
+    """What-if planner over an ordered list of ranked games.
+
+    Precomputes prefix sums of achievable remaining achievements/GS/TA and the
+    resulting overall GS completion %, so "what if I finish the next N games"
+    is O(1) and "how many games until X" is a binary search. Index n in each
+    array is the state after finishing the first n games of the order.
+
+    Only started games with something still achievable are planned: fully
+    blocked games can't be finished, and unstarted games aren't part of
+    ``total_gs_possible``, so planning them would push completion past 100%.
+    Unachievable GS is never counted as a gain, whatever the
+    count-unachievable setting.
+    """
+
+    def __init__(self, ranked, total_gs_earned, total_gs_possible, total_ta_earned=0):
+        ranked = _plannable(ranked)
+        self.games = [r["game"] for r in ranked]
+        self.total_gs_earned = total_gs_earned
+        self.total_gs_possible = total_gs_possible
+        self.total_ta_earned = total_ta_earned
+
+        self.cum_ach = [0]
+        self.cum_gs = [0]
+        self.cum_ta = [0]
+        for r in ranked:
+            self.cum_ach.append(self.cum_ach[-1] + r["achievable_ach"])
+            self.cum_gs.append(self.cum_gs[-1] + r["achievable_gs"])
+            self.cum_ta.append(self.cum_ta[-1] + r["achievable_ta"])
+        self.completion_pct = [self._pct(gs) for gs in self.cum_gs]
+
+    def _pct(self, gs_gain):
+        if self.total_gs_possible <= 0:
+            return 0.0
+        return (self.total_gs_earned + gs_gain) / self.total_gs_possible * 100
+
+    def after(self, n):
+        """Totals gained by finishing the first ``n`` games."""
+        n = max(0, min(n, len(self.games)))
+        return {
+            "games": n,
+            "last_game": self.games[n - 1] if n else None,
+            "achievements": self.cum_ach[n],
+            "gs": self.cum_gs[n],
+            "ta": self.cum_ta[n],
+            "gs_earned": self.total_gs_earned + self.cum_gs[n],
+            "ta_earned": self.total_ta_earned + self.cum_ta[n],
+            "completion_pct": self.completion_pct[n]
+        }
+
+    def games_for_gs(self, gs_gain):
+        """Fewest leading games whose remaining GS reaches ``gs_gain`` (None if unreachable)."""
+        n = bisect.bisect_left(self.cum_gs, gs_gain)
+        return n if n <= len(self.games) else None
+
+    def games_for_pct(self, target_pct):
+        """Fewest leading games that lift overall completion to ``target_pct``."""
+        n = bisect.bisect_left(self.completion_pct, target_pct)
+        return n if n <= len(self.games) else None
+
+    def as_dict(self):
+        return {
+            "games": self.games,
+            "cum_ach": self.cum_ach,
+            "cum_gs": self.cum_gs,
+            "cum_ta": self.cum_ta,
+            "completion_pct": self.completion_pct
+        }
+
+def _plannable(ranked):
+    # Started games with something still achievable (see CompletionPlanner)
+    return [r for r in ranked if r["achievable_ach"] > 0 and r["earned_ach"] > 0]
+
+class FewestAchievementsPlanner:
+    """Fewest achievements needed to reach a GS (or completion %) target.
+
+    A 0/1 knapsack over the games CompletionPlanner plans: finishing a game
+    costs its achievable remaining achievements and gains its achievable
+    remaining GS. ``best_gs[a]`` is the most GS reachable with at most ``a``
+    achievements, so it never decreases and a target is a binary search.
+    The table is O(games x achievements), which is small for one profile.
+    """
+
+    def __init__(self, ranked, total_gs_earned, total_gs_possible, total_ta_earned=0):
+        self.ranked = _plannable(ranked)
+        self.total_gs_earned = total_gs_earned
+        self.total_gs_possible = total_gs_possible
+        self.total_ta_earned = total_ta_earned
+
+        budget = sum(r["achievable_ach"] for r in self.ranked)
+        best = [0] * (budget + 1)
+        self._taken = []  # per game: 1 at budget a if taking it improved best[a]
+        for r in self.ranked:
+            cost, gain = r["achievable_ach"], r["achievable_gs"]
+            taken = bytearray(budget + 1)
+            for a in range(budget, cost - 1, -1):
+                if best[a - cost] + gain > best[a]:
+                    best[a] = best[a - cost] + gain
+                    taken[a] = 1
+            self._taken.append(taken)
+        self.best_gs = best
+        self.completion_pct = [self._pct(gs) for gs in best]
+
+    def _pct(self, gs_gain):
+        if self.total_gs_possible <= 0:
+            return 0.0
+        return (self.total_gs_earned + gs_gain) / self.total_gs_possible * 100
+
+    def _plan(self, budget):
+        """The games behind best_gs[budget], in ranking order."""
+        chosen = []
+        for i in range(len(self.ranked) - 1, -1, -1):
+            if self._taken[i][budget]:
+                chosen.append(self.ranked[i])
+                budget -= self.ranked[i]["achievable_ach"]
+        chosen.reverse()
+        gs = sum(r["achievable_gs"] for r in chosen)
+        ta = sum(r["achievable_ta"] for r in chosen)
+        return {
+            "games": [r["game"] for r in chosen],
+            "achievements": sum(r["achievable_ach"] for r in chosen),
+            "gs": gs,
+            "ta": ta,
+            "gs_earned": self.total_gs_earned + gs,
+            "ta_earned": self.total_ta_earned + ta,
+            "completion_pct": self._pct(gs)
+        }
+
+    def for_gs(self, gs_gain):
+        """Fewest-achievement plan that gains at least ``gs_gain`` GS (None if unreachable)."""
+        a = bisect.bisect_left(self.best_gs, gs_gain)
+        return self._plan(a) if a < len(self.best_gs) else None
+
+    def for_pct(self, target_pct):
+        """Fewest-achievement plan that lifts overall completion to ``target_pct`` (None if unreachable)."""
+        a = bisect.bisect_left(self.completion_pct, target_pct)
+        return self._plan(a) if a < len(self.best_gs) else None
+
+    def as_dict(self):
+        """The budgets where best_gs goes up; anything in between buys nothing more."""
+        steps = [a for a in range(len(self.best_gs)) if a == 0 or self.best_gs[a] > self.best_gs[a - 1]]
+        return {
+            "ach": steps,
+            "gs": [self.best_gs[a] for a in steps],
+            "completion_pct": [self.completion_pct[a] for a in steps]
+        }
+
+def write_json(data, output_path: Path):
+    with output_path.open("w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+def _detail_sort_key(ach):
+    # Sort by ratio (easiest first); achievements without a ratio go last
+    ratio = ach["ratio"]
+    return (ratio is None, ratio if ratio is not None else 0.0, ach["title"] or "")
+
+def build_game_detail(game, g, history=None):
+    """Achievement-level listing for one game (locked and earned, sorted by ratio).
+
+    ``history`` is the game's monthly series from ProgressHistory, if any.
+    """
+    locked = []
+    for ach in g.get("locked_achievements_all", []):
+        locked.append({
+            "title": ach["title"],
+            "gamerscore": ach["gamerscore"],
+            "ta": ach["ta"],
+            "ratio": ach["ratio"],
+            "dlc": ach["dlc"],
+            "unachievable": ach["unachievable"]
+        })
+    earned = []
+    for ach in g.get("earned_achievements", []):
+        earned.append({
+            "title": ach["title"],
+            "gamerscore": ach["gamerscore"],
+            "ta": ach["ta"],
+            "ratio": ach["ratio"],
+            "dlc": ach["dlc"]
+        })
+    locked.sort(key=_detail_sort_key)
+    earned.sort(key=_detail_sort_key)
+    return {"game": game, "locked": locked, "earned": earned, "history": history}
+
+def export_game_details(games, output_dir: Path, history_by_game=None, root: Path = None):
+    """Write content-addressed per-game detail files for the dashboard drill-down.
+
+    Each file is named after a hash of its contents, so a game's file is only
+    rewritten when its achievements change. Files no longer referenced by any
+    game are removed. Returns {game: URL path relative to ``root``}, the
+    directory page.html is served from (default: the current directory).
+    """
+    history_by_game = history_by_game or {}
+    output_dir.mkdir(parents=True, exist_ok=True)
+    root = (root or Path(".")).resolve()
+    try:
+        link_dir = output_dir.resolve().relative_to(root).as_posix()
+    except ValueError:
+        raise ValueError(f"{output_dir} is not under {root}, so the dashboard can't fetch its files") from None
+    detail_files = {}
+    wanted = set()
+
+    for game_name, g in games.items():
+        detail = build_game_detail(game_name, g, history_by_game.get(game_name))
+        payload = json.dumps(detail, indent=2, ensure_ascii=False, sort_keys=True)
+        digest = hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+        path = output_dir / f"{digest}.json"
+        if not path.exists():
+            with path.open("w", encoding="utf-8") as f:
+                f.write(payload)
+        wanted.add(path.name)
+        detail_files[game_name] = f"{link_dir}/{path.name}"
+
+    # Prune details for games whose data has changed or disappeared
+    for stale in output_dir.glob("*.json"):
+        if stale.name not in wanted:
+            stale.unlink()
+
+    return detail_files
+
 def export_main_stats(games, ranked, total_games, completed_games, total_gs_earned, total_gs_possible, 
                       total_ta_earned, total_ta_possible, overall_completion_pct, buckets, started_games,
-                      blocked, dlc_only, output_path: Path):
-    """Export main dashboard stats to JSON for HTML visualization."""
-    
+                      blocked, dlc_only, output_path: Path = None, *, detail_files=None, history=None, planners=None,
+                      include_dlc=None, count_unachievable=None):
+    """Export main dashboard stats to JSON for HTML visualization.
+
+    Writes to ``output_path`` when given; the data is returned either way.
+
+    ``detail_files`` maps game name -> per-game detail file (see
+    export_game_details); when given, each game links to its file.
+    ``history`` is a ProgressHistory whose daily/monthly series are included.
+    ``planners`` maps a name to a CompletionPlanner ("ranked", whose prefix
+    arrays drive the dashboard's what-if slider) or a FewestAchievementsPlanner
+    ("fewest", whose budget steps answer the dashboard's targets).
+    """
+    detail_files = detail_files or {}
+    include_dlc, count_unachievable = resolve_settings(include_dlc, count_unachievable)
+
     # Prepare recommendations
     recommendations = []
     for r in ranked:
@@ -195,13 +842,17 @@ def export_main_stats(games, ranked, total_games, completed_games, total_gs_earn
             "completion": r["completion"] * 100,
             "remaining_ach": r["remaining_ach"],
             "remaining_gs": r["remaining_gs"],
+            "remaining_ta": r["remaining_ta"],
             "avg_locked_ratio": r["avg_locked_ratio"],
+            "median_locked_ratio": r["median_locked_ratio"],
+            "p90_locked_ratio": r["p90_locked_ratio"],
             "unach_ach": r["unach_ach"],
             "dlc_remaining": r["dlc_remaining"],
             "earned_ach": r["earned_ach"],
             "total_ach": r["total_ach"],
             "earned_gs": r["earned_gs"],
-            "total_gs": r["total_gs"]
+            "total_gs": r["total_gs"],
+            "detail_file": detail_files.get(r["game"])
         })
     
     # Prepare blocked games
@@ -244,7 +895,7 @@ def export_main_stats(games, ranked, total_games, completed_games, total_gs_earn
         locked_ach_effective = g["locked_ach_total"]
         locked_ta_effective = g["locked_ta_total"]
         
-        if not COUNT_UNACHIEVABLE_IN_TOTAL:
+        if not count_unachievable:
             locked_gs_effective -= g["locked_gs_unach"]
             locked_ta_effective -= g["locked_ta_unach"]
             locked_ach_effective -= g["locked_ach_unach"]
@@ -269,12 +920,19 @@ def export_main_stats(games, ranked, total_games, completed_games, total_gs_earn
                 "completion_pct": completion_pct,
                 "is_completed": remaining_ach == 0,
                 "locked_unach_ach": g["locked_ach_unach"],
-                "locked_unach_gs": g["locked_gs_unach"]
+                "locked_unach_gs": g["locked_gs_unach"],
+                "earned_ratio_stats": g["earned_ratio_stats"].summary(),
+                "locked_ratio_stats": g["locked_ratio_stats"].summary(),
+                "detail_file": detail_files.get(game_name)
             })
     
     # Calculate overall TA ratios
     overall_ta_ratio_earned = (total_ta_earned / total_gs_earned) if total_gs_earned > 0 else None
     overall_ta_ratio_possible = (total_ta_possible / total_gs_possible) if total_gs_possible > 0 else None
+
+    # Profile-wide TARatio distribution, merged from the per-game accumulators
+    profile_earned_ratios = RatioStats.combined(*(g["earned_ratio_stats"] for g in games.values()))
+    profile_locked_ratios = RatioStats.combined(*(g["locked_ratio_stats"] for g in games.values()))
     
     export_data = {
         "profile_summary": {
@@ -288,7 +946,9 @@ def export_main_stats(games, ranked, total_games, completed_games, total_gs_earn
             "ta_completion_pct": (total_ta_earned / total_ta_possible * 100) if total_ta_possible > 0 else 0.0,
             "overall_ta_ratio_earned": overall_ta_ratio_earned,
             "overall_ta_ratio_possible": overall_ta_ratio_possible,
-            "started_games": started_games
+            "started_games": started_games,
+            "earned_ratio_stats": profile_earned_ratios.summary(),
+            "locked_ratio_stats": profile_locked_ratios.summary()
         },
         "completion_buckets": completion_buckets,
         "recommendations": recommendations,
@@ -299,25 +959,34 @@ def export_main_stats(games, ranked, total_games, completed_games, total_gs_earn
         },
         "dlc_only_games": dlc_only_games,
         "all_games": all_games_list,
+        "progress_history": {
+            "daily": history.daily_series(),
+            "monthly": history.monthly_series(),
+            "skipped_unlocks": history.skipped,
+            "late_unlocks": history.late
+        } if history is not None else None,
+        "planner": {name: p.as_dict() for name, p in (planners or {}).items()},
         "settings": {
-            "include_dlc": INCLUDE_DLC,
-            "count_unachievable_in_total": COUNT_UNACHIEVABLE_IN_TOTAL
+            "include_dlc": include_dlc,
+            "count_unachievable_in_total": count_unachievable
         }
     }
     
-    # Write to file
-    with output_path.open("w", encoding="utf-8") as f:
-        json.dump(export_data, f, indent=2, ensure_ascii=False)
+    if output_path is not None:
+        write_json(export_data, output_path)
     
     return export_data
 
-def export_dlc_data(games, output_path: Path):
+def export_dlc_data(games, output_path: Path = None, count_unachievable=None):
     """Export DLC completion data to JSON for HTML visualization.
+
+    Writes to ``output_path`` when given; the data is returned either way.
     
     Returns a dictionary with:
     - dlcs: list of DLCs grouped by game
     - summary: overall stats
     """
+    _, count_unachievable = resolve_settings(count_unachievable=count_unachievable)
     dlc_data = {}
     game_stats_dict = {}
     summary = {
@@ -353,8 +1022,8 @@ def export_dlc_data(games, output_path: Path):
                     "locked_ta": 0,
                     "locked_unach_ach": 0,
                     "locked_unach_gs": 0,
-                    "earned_ratios": [],
-                    "locked_ratios": []
+                    "earned_ratio_stats": RatioStats(),
+                    "locked_ratio_stats": RatioStats()
                 }
             
             dlc = dlcs_for_game[dlc_name]
@@ -362,7 +1031,7 @@ def export_dlc_data(games, output_path: Path):
             dlc["earned_gs"] += ach.get("gamerscore", 0)
             dlc["earned_ta"] += ach.get("ta", 0)
             if ach.get("ratio") is not None:
-                dlc["earned_ratios"].append(ach.get("ratio"))
+                dlc["earned_ratio_stats"].add(ach.get("ratio"))
         
         # Process locked achievements
         for ach in game_data.get("locked_achievements_all", []):
@@ -382,8 +1051,8 @@ def export_dlc_data(games, output_path: Path):
                     "locked_ta": 0,
                     "locked_unach_ach": 0,
                     "locked_unach_gs": 0,
-                    "earned_ratios": [],
-                    "locked_ratios": []
+                    "earned_ratio_stats": RatioStats(),
+                    "locked_ratio_stats": RatioStats()
                 }
             
             dlc = dlcs_for_game[dlc_name]
@@ -391,7 +1060,7 @@ def export_dlc_data(games, output_path: Path):
             dlc["locked_gs"] += ach.get("gamerscore", 0)
             dlc["locked_ta"] += ach.get("ta", 0)
             if ach.get("ratio") is not None:
-                dlc["locked_ratios"].append(ach.get("ratio"))
+                dlc["locked_ratio_stats"].add(ach.get("ratio"))
             
             if ach.get("unachievable", False):
                 dlc["locked_unach_ach"] += 1
@@ -404,31 +1073,34 @@ def export_dlc_data(games, output_path: Path):
             
             # Effective remaining (excluding unachievable if configured)
             effective_locked_ach = dlc["locked_ach"]
-            if not COUNT_UNACHIEVABLE_IN_TOTAL:
+            if not count_unachievable:
                 effective_locked_ach -= dlc["locked_unach_ach"]
             
             total_ta = dlc["earned_ta"] + dlc["locked_ta"]
             
-            # Calculate average TA ratios
-            all_earned_ratios = dlc.get("earned_ratios", [])
-            all_locked_ratios = dlc.get("locked_ratios", [])
-            avg_earned_ratio = (sum(all_earned_ratios) / len(all_earned_ratios)) if all_earned_ratios else None
-            avg_locked_ratio = (sum(all_locked_ratios) / len(all_locked_ratios)) if all_locked_ratios else None
-            avg_overall_ratio = None
-            all_ratios = all_earned_ratios + all_locked_ratios
-            if all_ratios:
-                avg_overall_ratio = sum(all_ratios) / len(all_ratios)
+            # Calculate average TA ratios (accumulators are swapped for their
+            # JSON summaries so the export stays serialisable)
+            earned_stats = dlc.pop("earned_ratio_stats")
+            locked_stats = dlc.pop("locked_ratio_stats")
+            all_stats = RatioStats.combined(earned_stats, locked_stats)
+            avg_earned_ratio = earned_stats.average()
+            avg_locked_ratio = locked_stats.average()
+            avg_overall_ratio = all_stats.average()
             
             dlc["total_ach"] = total_ach
             dlc["total_gs"] = total_gs
             dlc["total_ta"] = total_ta
             dlc["remaining_ach"] = max(0, effective_locked_ach)
-            dlc["remaining_gs"] = max(0, dlc["locked_gs"] - (dlc["locked_unach_gs"] if not COUNT_UNACHIEVABLE_IN_TOTAL else 0))
+            dlc["remaining_gs"] = max(0, dlc["locked_gs"] - (dlc["locked_unach_gs"] if not count_unachievable else 0))
             dlc["completion_pct"] = (dlc["earned_gs"] / total_gs * 100) if total_gs > 0 else 0.0
             dlc["is_completed"] = (dlc["remaining_ach"] == 0) and (total_ach > 0)
             dlc["avg_earned_ratio"] = avg_earned_ratio
             dlc["avg_locked_ratio"] = avg_locked_ratio
             dlc["avg_overall_ratio"] = avg_overall_ratio
+            dlc["median_overall_ratio"] = all_stats.median()
+            dlc["p90_overall_ratio"] = all_stats.p90()
+            dlc["earned_ratio_stats"] = earned_stats.summary()
+            dlc["locked_ratio_stats"] = locked_stats.summary()
             
             # Add to summary
             summary["total_dlcs"] += 1
@@ -491,17 +1163,16 @@ def export_dlc_data(games, output_path: Path):
     overall_stats["total_gs"] = overall_stats["total_earned_gs"] + overall_stats["total_locked_gs"]
     overall_stats["total_ta"] = overall_stats["total_earned_ta"] + overall_stats["total_locked_ta"]
     
-    # Calculate overall average TA ratio
-    all_earned_ratios = []
-    all_locked_ratios = []
-    for g in games.values():
-        all_earned_ratios.extend(g.get("earned_ratios", []))
-        all_locked_ratios.extend(g.get("locked_ratios_achievable", []))
-    
-    overall_stats["avg_earned_ratio"] = (sum(all_earned_ratios) / len(all_earned_ratios)) if all_earned_ratios else None
-    overall_stats["avg_locked_ratio"] = (sum(all_locked_ratios) / len(all_locked_ratios)) if all_locked_ratios else None
-    all_ratios_combined = all_earned_ratios + all_locked_ratios
-    overall_stats["avg_overall_ratio"] = (sum(all_ratios_combined) / len(all_ratios_combined)) if all_ratios_combined else None
+    # Calculate overall average TA ratio by merging the per-game accumulators
+    profile_earned = RatioStats.combined(*(g["earned_ratio_stats"] for g in games.values()))
+    profile_locked = RatioStats.combined(*(g["locked_ratio_stats"] for g in games.values()))
+    profile_overall = RatioStats.combined(profile_earned, profile_locked)
+
+    overall_stats["avg_earned_ratio"] = profile_earned.average()
+    overall_stats["avg_locked_ratio"] = profile_locked.average()
+    overall_stats["avg_overall_ratio"] = profile_overall.average()
+    overall_stats["median_overall_ratio"] = profile_overall.median()
+    overall_stats["p90_overall_ratio"] = profile_overall.p90()
     
     export_data = {
         "summary": summary,
@@ -511,165 +1182,552 @@ def export_dlc_data(games, output_path: Path):
         "game_stats": game_stats_dict
     }
     
-    # Write to file
-    with output_path.open("w", encoding="utf-8") as f:
-        json.dump(export_data, f, indent=2, ensure_ascii=False)
+    if output_path is not None:
+        write_json(export_data, output_path)
     
     return export_data
 
-def main():
-    # Use default settings (no CLI arguments)
-    global INCLUDE_DLC, COUNT_UNACHIEVABLE_IN_TOTAL
+class Catalog:
+    """Game/DLC/achievement catalog shared by every Profile loaded in one process.
 
-    if not UNLOCKED_PATH.exists():
-        raise FileNotFoundError(f"Missing {UNLOCKED_PATH} (your unlocked export).")
-    if not LOCKED_PATH.exists():
-        raise FileNotFoundError(f"Missing {LOCKED_PATH} (your locked export).")
+    Interns game names, DLC names and achievement titles, and hands out
+    integer ids for games, DLCs and achievements. An achievement id maps to
+    its facts (game, DLC, GS, TA, ratio, title) as first seen. Per game and
+    DLC it keeps achievement counts and GS/TA totals, plus delisted status.
 
-    games = defaultdict(lambda: {
-        "earned_ach": 0, "earned_gs": 0, "earned_ta": 0,
-        "earned_dlc_ach": 0,
-        "locked_ach_total": 0, "locked_gs_total": 0, "locked_ta_total": 0,
-        "locked_dlc_ach": 0,
-        "locked_ach_unach": 0, "locked_gs_unach": 0, "locked_ta_unach": 0,
-        "locked_dlc_unach": 0,
-        "earned_ratios": [],
-        "locked_ratios_achievable": []
-    })
+    The catalog only shares strings and per-achievement values; a profile's
+    results never depend on which other profiles were loaded (see Profile).
+    """
 
-    read_unlocked(games)
-    read_locked(games)
+    def __init__(self, delisted=DELISTED_GAMES):
+        self.game_names = []    # game id -> name
+        self.dlc_names = []     # dlc id -> name
+        self.dlc_games = []     # dlc id -> game id
+        self._game_ids = {}
+        self._dlc_ids = {}      # (game id, dlc name) -> dlc id
+        self._strings = {}
+        self._game_totals = []  # game id -> [achievements, gs, ta]
+        self._dlc_totals = []   # dlc id -> [achievements, gs, ta]
+        self._delisted = set()
 
-    # ===== PROFILE-LEVEL STATS =====
-    # Sum ALL earned GS/TA directly from unlocked.csv to get true totals
-    # IMPORTANT: Count ALL achievements regardless of DLC settings for total earned
-    # (DLC filtering only affects recommendations, not your total earned stats)
-    total_gs_earned = 0
-    total_ta_earned = 0
-    try:
-        required = {"GameName","Gamerscore","TAScore","TARatio","DLCName","UnlockDate"}
-        unlocked_rows = load_csv(UNLOCKED_PATH, required)
-        for r in unlocked_rows:
-            unlock_date = str(r.get("UnlockDate","")).strip()
-            if not unlock_date:
-                continue
-            # Count ALL achievements for total earned (don't filter DLC here)
-            total_gs_earned += safe_int(r.get("Gamerscore", 0))
-            total_ta_earned += safe_int(r.get("TAScore", 0))
-    except Exception as e:
-        # Fallback to games dictionary if CSV read fails
-        total_gs_earned = sum(g.get("earned_gs", 0) for g in games.values())
-        total_ta_earned = sum(g.get("earned_ta", 0) for g in games.values())
-    
-    total_games = 0
-    completed_games = 0
-    total_gs_possible = 0
-    total_ta_possible = 0
+        # Achievement facts, indexed by achievement id
+        self._ach_ids = {}
+        self.ach_game = []
+        self.ach_dlc = []
+        self.ach_gs = []
+        self.ach_ta = []
+        self.ach_ratio = []
+        self.ach_title = []
 
-    for game, g in games.items():
-        # Effective locked GS (respecting unachievable setting)
-        locked_gs_effective = g["locked_gs_total"]
-        locked_ach_effective = g["locked_ach_total"]
-        locked_ta_effective = g["locked_ta_total"]
+        for name in delisted:
+            self.mark_delisted(name)
 
-        if not COUNT_UNACHIEVABLE_IN_TOTAL:
-            locked_gs_effective -= g["locked_gs_unach"]
-            locked_ta_effective -= g["locked_ta_unach"]
-            locked_ach_effective -= g["locked_ach_unach"]
+    def intern(self, s):
+        """Return the catalog's shared copy of string ``s``."""
+        if s is None:
+            return None
+        return self._strings.setdefault(s, s)
 
-        # For possible totals, use earned + locked (or just earned if no locked)
-        total_gs = g["earned_gs"] + max(0, locked_gs_effective)
-        total_ta = g["earned_ta"] + max(0, locked_ta_effective)
-        remaining_ach = max(0, locked_ach_effective)
+    def game_id(self, name):
+        name = self.intern(name)
+        gid = self._game_ids.get(name)
+        if gid is None:
+            gid = self._game_ids[name] = len(self.game_names)
+            self.game_names.append(name)
+            self._game_totals.append([0, 0, 0])
+        return gid
 
-        # Count all games with any earned achievements
-        if g.get("earned_gs", 0) > 0 or g.get("earned_ach", 0) > 0:
-            total_games += 1
-            if remaining_ach == 0:
-                completed_games += 1
-            
-            # Add to possible totals (use earned_gs as minimum if total_gs is somehow 0)
-            total_gs_possible += max(total_gs, g.get("earned_gs", 0))
-            total_ta_possible += max(total_ta, g.get("earned_ta", 0))
-
-    overall_completion_pct = (
-        (total_gs_earned / total_gs_possible) * 100
-        if total_gs_possible > 0 else 0.0
-    )
-
-    # Completion buckets for profile overview (only consider started games)
-    # Evenly spread buckets: 0-19, 20-39, 40-59, 60-79, 80-94, 95-99, 100
-    bucket_labels = ["0-19%", "20-39%", "40-59%", "60-79%", "80-94%", "95-99%", "100%"]
-    buckets = {label: 0 for label in bucket_labels}
-    started_games = 0
-
-    for game, g in games.items():
-        locked_gs_effective = g["locked_gs_total"]
-        locked_ach_effective = g["locked_ach_total"]
-        if not COUNT_UNACHIEVABLE_IN_TOTAL:
-            locked_gs_effective -= g["locked_gs_unach"]
-            locked_ach_effective -= g["locked_ach_unach"]
+    def dlc_id(self, game_id, name):
+        """Id of DLC ``name`` within ``game_id``; None for base-game achievements."""
+        if not name:
+            return None
+        key = (game_id, self.intern(name))
+        did = self._dlc_ids.get(key)
+        if did is None:
+            did = self._dlc_ids[key] = len(self.dlc_names)
+            self.dlc_names.append(key[1])
+            self.dlc_games.append(game_id)
+            self._dlc_totals.append([0, 0, 0])
+        return did
 
-        total_gs = g["earned_gs"] + max(0, locked_gs_effective)
-        if total_gs <= 0:
-            continue
-        started_games += 1
-        pct = (g["earned_gs"] / total_gs) * 100
-        # place into bucket
-        if pct >= 100:
-            buckets["100%"] += 1
-        elif pct >= 95:
-            buckets["95-99%"] += 1
-        elif pct >= 80:
-            buckets["80-94%"] += 1
-        elif pct >= 60:
-            buckets["60-79%"] += 1
-        elif pct >= 40:
-            buckets["40-59%"] += 1
-        elif pct >= 20:
-            buckets["20-39%"] += 1
+    def achievement_id(self, game_id, dlc_id, gs, ta, ratio, title, occurrence=0):
+        """Id of an achievement, registering its facts the first time it is seen.
+
+        Titled achievements are shared across exports and identified by game,
+        DLC, title and ``occurrence`` (which tells apart repeated titles in
+        one export). An untitled achievement can't be matched reliably, so
+        each call registers a new private id that is left out of the totals.
+        """
+        title = self.intern(title)
+        key = (game_id, dlc_id, title, occurrence)
+        aid = self._ach_ids.get(key) if title else None
+        if aid is None:
+            aid = len(self.ach_game)
+            self.ach_game.append(game_id)
+            self.ach_dlc.append(dlc_id)
+            self.ach_gs.append(gs)
+            self.ach_ta.append(ta)
+            self.ach_ratio.append(ratio)
+            self.ach_title.append(title)
+            if title:
+                self._ach_ids[key] = aid
+                totals = [self._game_totals[game_id]]
+                if dlc_id is not None:
+                    totals.append(self._dlc_totals[dlc_id])
+                for t in totals:
+                    t[0] += 1
+                    t[1] += gs
+                    t[2] += ta
+        return aid
+
+    def mark_delisted(self, name):
+        self._delisted.add(self.game_id(name))
+
+    def is_delisted(self, game_id):
+        return game_id in self._delisted
+
+    def game_facts(self, name):
+        """Catalog-level facts for a game (titled achievements only), or None if it has not been seen."""
+        gid = self._game_ids.get(name)
+        if gid is None:
+            return None
+        ach, gs, ta = self._game_totals[gid]
+        dlcs = {}
+        for (dlc_gid, dlc_name), did in self._dlc_ids.items():
+            if dlc_gid == gid:
+                d_ach, d_gs, d_ta = self._dlc_totals[did]
+                dlcs[dlc_name] = {"achievements": d_ach, "gs": d_gs, "ta": d_ta}
+        return {
+            "id": gid,
+            "achievements": ach,
+            "gs": gs,
+            "ta": ta,
+            "delisted": self.is_delisted(gid),
+            "dlcs": dlcs
+        }
+
+
+class Profile:
+    """In-memory achievement profile built from the unlocked and locked exports.
+
+    ``unlocked`` and ``locked`` may each be a file path, an open text file or
+    an iterable of row dicts (as csv.DictReader yields). Rows are read once;
+    the per-game aggregates and every view derived from them are computed on
+    first use and cached per settings, so a long-lived process can serve many
+    queries without touching disk again. Settings default to the module
+    constants when left as None. Returned structures are shared with the
+    cache, so treat them as read-only.
+
+    Pass a shared ``catalog`` when loading many profiles. The rows are then
+    registered with the catalog and dropped (``unlocked_rows`` and
+    ``locked_rows`` are None). The profile keeps its earned achievement ids
+    with their unlock days, its locked achievement ids and unachievable
+    flags, and its own GS/TA/ratio wherever its rows disagree with the
+    catalog, so results match an uncatalogued profile of the same exports.
+    ``games()`` then holds counters only; per-achievement listings are built
+    on demand by ``listings()`` and are not cached.
+    """
+
+    BUCKET_LABELS = ["0-19%", "20-39%", "40-59%", "60-79%", "80-94%", "95-99%", "100%"]
+
+    def __init__(self, unlocked, locked, catalog=None):
+        self.unlocked_rows = load_rows(unlocked, UNLOCKED_REQUIRED, "unlocked")
+        self.locked_rows = load_rows(locked, LOCKED_REQUIRED, "locked")
+        self.catalog = catalog
+        self._cache = {}
+        if catalog is not None:
+            self._register(catalog)
+            self.unlocked_rows = self.locked_rows = None
+
+    def _register(self, catalog):
+        self._earned = {}       # achievement id -> unlock day (None if unparseable)
+        self._locked = []       # achievement ids of the locked export, in row order
+        self._unach = set()     # locked ids the export flags unachievable
+        self._own_facts = {}    # achievement id -> (gs, ta, ratio) where the rows disagree with the catalog
+        occurrences = defaultdict(int)
+        parser = UnlockDateParser(r.get("UnlockDate") for r in self.unlocked_rows)
+
+        def ach_id(r):
+            gid = catalog.game_id((r.get("GameName") or "").strip())
+            did = catalog.dlc_id(gid, (r.get("DLCName") or "").strip())
+            gs = safe_int(r.get("Gamerscore", 0))
+            ta = safe_int(r.get("TAScore", 0))
+            ratio = safe_float(r.get("TARatio"))
+            title = _row_title(r)
+            occurrence = occurrences[(gid, did, title)]
+            occurrences[(gid, did, title)] += 1
+            aid = catalog.achievement_id(gid, did, gs, ta, ratio, title, occurrence)
+            # TA scores and ratios drift over time, so this export's values win
+            if (catalog.ach_gs[aid], catalog.ach_ta[aid], catalog.ach_ratio[aid]) != (gs, ta, ratio):
+                self._own_facts[aid] = (gs, ta, ratio)
+            return aid
+
+        for r in self.unlocked_rows:
+            # Same check as read_unlocked: rows without an UnlockDate aren't unlocks
+            if str(r.get("UnlockDate","")).strip():
+                self._earned[ach_id(r)] = parser.parse(r.get("UnlockDate"))
+        for r in self.locked_rows:
+            aid = ach_id(r)
+            self._locked.append(aid)
+            if is_truthy(r.get("Unachieveable","")):
+                self._unach.add(aid)
+
+    def _facts(self, aid):
+        """(gs, ta, ratio) of an achievement as this profile's exports give them."""
+        facts = self._own_facts.get(aid)
+        if facts is None:
+            cat = self.catalog
+            facts = (cat.ach_gs[aid], cat.ach_ta[aid], cat.ach_ratio[aid])
+        return facts
+
+    def _cached(self, key, build):
+        if key not in self._cache:
+            self._cache[key] = build()
+        return self._cache[key]
+
+    def games(self, include_dlc=None):
+        """Per-game aggregates (see new_games) keyed by game name.
+
+        With a catalog these are counters only; use listings() for the
+        per-achievement lists.
+        """
+        include_dlc, _ = resolve_settings(include_dlc)
+
+        def build():
+            if self.catalog is None:
+                games = new_games()
+                read_unlocked(games, self.unlocked_rows, include_dlc)
+                read_locked(games, self.locked_rows, include_dlc)
+                return dict(games)
+            return self._catalog_games(include_dlc, listing=False)
+        return self._cached(("games", include_dlc), build)
+
+    def listings(self, include_dlc=None):
+        """Like games(), but with the per-achievement lists.
+
+        The detail and DLC exports use these. With a catalog they are rebuilt
+        on every call and not cached.
+        """
+        include_dlc, _ = resolve_settings(include_dlc)
+        if self.catalog is None:
+            return self.games(include_dlc)
+        return self._catalog_games(include_dlc, listing=True)
+
+    def _catalog_games(self, include_dlc, listing):
+        # Same walk as read_unlocked/read_locked, over ids instead of rows
+        cat = self.catalog
+        games = new_games()
+        for aid in self._earned:
+            did = cat.ach_dlc[aid]
+            if did is None or include_dlc:
+                gs, ta, ratio = self._facts(aid)
+                add_unlocked(games, cat.game_names[cat.ach_game[aid]], cat.dlc_names[did] if did is not None else "",
+                             gs, ta, ratio, cat.ach_title[aid], listing=listing)
+        for aid in self._locked:
+            did = cat.ach_dlc[aid]
+            if did is None or include_dlc:
+                gid = cat.ach_game[aid]
+                gs, ta, ratio = self._facts(aid)
+                unach = aid in self._unach or cat.is_delisted(gid)
+                add_locked(games, cat.game_names[gid], cat.dlc_names[did] if did is not None else "",
+                           gs, ta, ratio, cat.ach_title[aid], unach, listing=listing)
+        return dict(games)
+
+    def earned_totals(self):
+        """(GS, TA) earned across ALL unlocked rows.
+
+        Counts every achievement regardless of DLC settings - DLC filtering
+        only affects recommendations, not your total earned stats.
+        """
+        def build():
+            if self.catalog is not None:
+                facts = [self._facts(aid) for aid in self._earned]
+                return sum(f[0] for f in facts), sum(f[1] for f in facts)
+            total_gs_earned = 0
+            total_ta_earned = 0
+            for r in self.unlocked_rows:
+                if not str(r.get("UnlockDate","")).strip():
+                    continue
+                total_gs_earned += safe_int(r.get("Gamerscore", 0))
+                total_ta_earned += safe_int(r.get("TAScore", 0))
+            return total_gs_earned, total_ta_earned
+        return self._cached(("earned_totals",), build)
+
+    def unlock_events(self):
+        """(day, game, gs, ta) per unlock, for ProgressHistory.update_events."""
+        if self.catalog is None:
+            return unlock_events(self.unlocked_rows)
+        names, games = self.catalog.game_names, self.catalog.ach_game
+        return ((day, names[games[aid]]) + self._facts(aid)[:2] for aid, day in self._earned.items())
+
+    def summary(self, include_dlc=None, count_unachievable=None):
+        """Profile-level totals: games started/completed, GS/TA earned and possible."""
+        include_dlc, count_unachievable = resolve_settings(include_dlc, count_unachievable)
+
+        def build():
+            total_gs_earned, total_ta_earned = self.earned_totals()
+            total_games = 0
+            completed_games = 0
+            total_gs_possible = 0
+            total_ta_possible = 0
+
+            for g in self.games(include_dlc).values():
+                # Effective locked GS (respecting unachievable setting)
+                locked_gs_effective = g["locked_gs_total"]
+                locked_ach_effective = g["locked_ach_total"]
+                locked_ta_effective = g["locked_ta_total"]
+
+                if not count_unachievable:
+                    locked_gs_effective -= g["locked_gs_unach"]
+                    locked_ta_effective -= g["locked_ta_unach"]
+                    locked_ach_effective -= g["locked_ach_unach"]
+
+                # For possible totals, use earned + locked (or just earned if no locked)
+                total_gs = g["earned_gs"] + max(0, locked_gs_effective)
+                total_ta = g["earned_ta"] + max(0, locked_ta_effective)
+                remaining_ach = max(0, locked_ach_effective)
+
+                # Count all games with any earned achievements
+                if g.get("earned_gs", 0) > 0 or g.get("earned_ach", 0) > 0:
+                    total_games += 1
+                    if remaining_ach == 0:
+                        completed_games += 1
+
+                    # Add to possible totals (use earned_gs as minimum if total_gs is somehow 0)
+                    total_gs_possible += max(total_gs, g.get("earned_gs", 0))
+                    total_ta_possible += max(total_ta, g.get("earned_ta", 0))
+
+            return {
+                "total_games": total_games,
+                "completed_games": completed_games,
+                "total_gs_earned": total_gs_earned,
+                "total_gs_possible": total_gs_possible,
+                "total_ta_earned": total_ta_earned,
+                "total_ta_possible": total_ta_possible,
+                "overall_completion_pct": (
+                    (total_gs_earned / total_gs_possible) * 100
+                    if total_gs_possible > 0 else 0.0
+                )
+            }
+        return self._cached(("summary", include_dlc, count_unachievable), build)
+
+    def buckets(self, include_dlc=None, count_unachievable=None):
+        """Completion buckets over started games; returns (buckets, started_games)."""
+        include_dlc, count_unachievable = resolve_settings(include_dlc, count_unachievable)
+
+        def build():
+            # Evenly spread buckets: 0-19, 20-39, 40-59, 60-79, 80-94, 95-99, 100
+            buckets = {label: 0 for label in self.BUCKET_LABELS}
+            started_games = 0
+
+            for g in self.games(include_dlc).values():
+                locked_gs_effective = g["locked_gs_total"]
+                if not count_unachievable:
+                    locked_gs_effective -= g["locked_gs_unach"]
+
+                total_gs = g["earned_gs"] + max(0, locked_gs_effective)
+                if total_gs <= 0:
+                    continue
+                started_games += 1
+                pct = (g["earned_gs"] / total_gs) * 100
+                # place into bucket
+                if pct >= 100:
+                    buckets["100%"] += 1
+                elif pct >= 95:
+                    buckets["95-99%"] += 1
+                elif pct >= 80:
+                    buckets["80-94%"] += 1
+                elif pct >= 60:
+                    buckets["60-79%"] += 1
+                elif pct >= 40:
+                    buckets["40-59%"] += 1
+                elif pct >= 20:
+                    buckets["20-39%"] += 1
+                else:
+                    buckets["0-19%"] += 1
+            return buckets, started_games
+        return self._cached(("buckets", include_dlc, count_unachievable), build)
+
+    def ranking(self, include_dlc=None, count_unachievable=None):
+        """Unfinished games sorted by remaining achievements (fewest first)."""
+        include_dlc, count_unachievable = resolve_settings(include_dlc, count_unachievable)
+
+        def build():
+            ranked = []
+            for game, g in self.games(include_dlc).items():
+                result = get_game_info(game, g, count_unachievable)
+                if result:
+                    ranked.append(result)
+            # fewer achievements = higher priority
+            ranked.sort(key=lambda x: x["remaining_ach"])
+            return ranked
+        return self._cached(("ranking", include_dlc, count_unachievable), build)
+
+    def blocked(self, include_dlc=None):
+        """(game, unach_count, unach_gs, locked_total) for games with unachievable achievements."""
+        include_dlc, _ = resolve_settings(include_dlc)
+
+        def build():
+            return [(game, g["locked_ach_unach"], g["locked_gs_unach"], g["locked_ach_total"])
+                    for game, g in self.games(include_dlc).items() if g["locked_ach_unach"] > 0]
+        return self._cached(("blocked", include_dlc), build)
+
+    def dlc_only(self, include_dlc=None, count_unachievable=None):
+        """(game, remaining) for games whose remaining achievements are all DLC."""
+        include_dlc, count_unachievable = resolve_settings(include_dlc, count_unachievable)
+
+        def build():
+            dlc_only = []
+            for game, g in self.games(include_dlc).items():
+                if g["locked_ach_total"] <= 0:
+                    continue
+                locked_ach_effective = g["locked_ach_total"]
+                if not count_unachievable:
+                    locked_ach_effective -= g["locked_ach_unach"]
+
+                dlc_remaining_effective = g["locked_dlc_ach"] - (g["locked_dlc_unach"] if not count_unachievable else 0)
+                if locked_ach_effective > 0 and locked_ach_effective == dlc_remaining_effective:
+                    dlc_only.append((game, locked_ach_effective))
+            return dlc_only
+        return self._cached(("dlc_only", include_dlc, count_unachievable), build)
+
+    def _planner_args(self, include_dlc, count_unachievable):
+        # The summary's earned totals include DLC whatever the setting, but its
+        # possible total doesn't when DLC is excluded. Plan from earned totals
+        # of the same started games so completion can't pass 100%.
+        started = [g for g in self.games(include_dlc).values() if g["earned_gs"] > 0 or g["earned_ach"] > 0]
+        return (self.ranking(include_dlc, count_unachievable),
+                sum(g["earned_gs"] for g in started),
+                self.summary(include_dlc, count_unachievable)["total_gs_possible"],
+                sum(g["earned_ta"] for g in started))
+
+    def planner(self, include_dlc=None, count_unachievable=None):
+        """CompletionPlanner over the ranking, in recommendation order."""
+        include_dlc, count_unachievable = resolve_settings(include_dlc, count_unachievable)
+        return self._cached(("planner", include_dlc, count_unachievable),
+                            lambda: CompletionPlanner(*self._planner_args(include_dlc, count_unachievable)))
+
+    def fewest_planner(self, include_dlc=None, count_unachievable=None):
+        """FewestAchievementsPlanner over the same games as planner()."""
+        include_dlc, count_unachievable = resolve_settings(include_dlc, count_unachievable)
+        return self._cached(("fewest_planner", include_dlc, count_unachievable),
+                            lambda: FewestAchievementsPlanner(*self._planner_args(include_dlc, count_unachievable)))
+
+    def dlc_stats(self, include_dlc=None, count_unachievable=None):
+        """The dlc_data.json payload (see export_dlc_data)."""
+        include_dlc, count_unachievable = resolve_settings(include_dlc, count_unachievable)
+        return self._cached(("dlc_stats", include_dlc, count_unachievable),
+                            lambda: export_dlc_data(self.listings(include_dlc), None, count_unachievable))
+
+    def main_stats(self, include_dlc=None, count_unachievable=None, detail_files=None, history=None):
+        """The main_stats.json payload (see export_main_stats).
+
+        Only cached when no detail files or history are attached, since those
+        come from outside the profile.
+        """
+        include_dlc, count_unachievable = resolve_settings(include_dlc, count_unachievable)
+
+        def build():
+            s = self.summary(include_dlc, count_unachievable)
+            buckets, started_games = self.buckets(include_dlc, count_unachievable)
+            planners = {"ranked": self.planner(include_dlc, count_unachievable),
+                        "fewest": self.fewest_planner(include_dlc, count_unachievable)}
+            return export_main_stats(self.games(include_dlc), self.ranking(include_dlc, count_unachievable),
+                                     s["total_games"], s["completed_games"], s["total_gs_earned"], s["total_gs_possible"],
+                                     s["total_ta_earned"], s["total_ta_possible"], s["overall_completion_pct"],
+                                     buckets, started_games, self.blocked(include_dlc),
+                                     self.dlc_only(include_dlc, count_unachievable),
+                                     output_path=None, detail_files=detail_files, history=history,
+                                     planners=planners, include_dlc=include_dlc,
+                                     count_unachievable=count_unachievable)
+        if detail_files is None and history is None:
+            return self._cached(("main_stats", include_dlc, count_unachievable), build)
+        return build()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze TrueAchievements exports and write the dashboard JSON.")
+    sub = parser.add_subparsers(dest="command")
+
+    plan = sub.add_parser("plan", help="what-if completion planner (prints, writes no files)")
+    plan.add_argument("--next", type=int, metavar="N", help="gains from finishing the next N games")
+    plan.add_argument("--target-gs", type=int, metavar="GS", help="games needed to earn GS more gamerscore")
+    plan.add_argument("--target-pct", type=float, metavar="PCT", help="games needed to reach PCT%% overall completion")
+    plan.add_argument("--fewest", action="store_true",
+                      help="answer targets with the games needing the fewest achievements, in any order")
+    return parser.parse_args(argv)
+
+def print_plan(planner, args, fewest=None):
+    """Answer the planner queries from ``args`` on stdout.
+
+    With ``fewest`` (a FewestAchievementsPlanner) the targets are answered by
+    it instead of by finishing games in recommendation order.
+    """
+    def show(label, n):
+        if n is None:
+            print(f"{label}: not reachable by finishing games")
+            return
+        r = planner.after(n)
+        print(f"{label}: finish {r['games']} game(s) -> +{r['achievements']} achievements, "
+              f"+{r['gs']:,} GS, +{r['ta']:,} TA, {r['completion_pct']:.2f}% overall completion")
+
+    if args.next is None and args.target_gs is None and args.target_pct is None:
+        for n in (1, 5, 10, 25, 50):
+            if n <= len(planner.games):
+                show(f"Next {n}", n)
+    if args.next is not None:
+        show(f"Next {args.next}", args.next)
+    def show_fewest(label, r):
+        if r is None:
+            print(f"{label}: not reachable by finishing games")
+            return
+        print(f"{label}: {r['achievements']} achievements across {len(r['games'])} game(s) -> "
+              f"+{r['gs']:,} GS, +{r['ta']:,} TA, {r['completion_pct']:.2f}% overall completion")
+        for game in r["games"]:
+            print(f"  {game}")
+
+    if args.target_gs is not None:
+        if fewest is not None:
+            show_fewest(f"+{args.target_gs:,} GS", fewest.for_gs(args.target_gs))
+        else:
+            show(f"+{args.target_gs:,} GS", planner.games_for_gs(args.target_gs))
+    if args.target_pct is not None:
+        if fewest is not None:
+            show_fewest(f"{args.target_pct:g}% completion", fewest.for_pct(args.target_pct))
         else:
-            buckets["0-19%"] += 1
+            show(f"{args.target_pct:g}% completion", planner.games_for_pct(args.target_pct))
 
-    ranked = []
-    for game, g in games.items():
-        result = get_game_info(game, g)
-        if result:
-            ranked.append(result)
+def main(argv=None):
+    # Settings come from the constants at the top of the file
+    args = parse_args(argv)
 
-    # Sort by remaining achievements (ascending) - fewer achievements = higher priority
-    ranked.sort(key=lambda x: x["remaining_ach"])
-        
-    # Games with any unachievable achievements (for export)
-    blocked = []
-    for game, g in games.items():
-        if g["locked_ach_unach"] > 0:
-            blocked.append((game, g["locked_ach_unach"], g["locked_gs_unach"], g["locked_ach_total"]))
-
-    # Games with only DLC remaining (for export)
-    dlc_only = []
-    for game, g in games.items():
-        if g["locked_ach_total"] <= 0:
-            continue
-        locked_ach_effective = g["locked_ach_total"]
-        if not COUNT_UNACHIEVABLE_IN_TOTAL:
-            locked_ach_effective -= g["locked_ach_unach"]
+    if not UNLOCKED_PATH.exists():
+        raise FileNotFoundError(f"Missing {UNLOCKED_PATH} (your unlocked export).")
+    if not LOCKED_PATH.exists():
+        raise FileNotFoundError(f"Missing {LOCKED_PATH} (your locked export).")
+
+    profile = Profile(UNLOCKED_PATH, LOCKED_PATH)
+
+    if args.command == "plan":
+        print_plan(profile.planner(), args, profile.fewest_planner() if args.fewest else None)
+        return
 
-        dlc_remaining_effective = g["locked_dlc_ach"] - (g["locked_dlc_unach"] if not COUNT_UNACHIEVABLE_IN_TOTAL else 0)
-        if locked_ach_effective > 0 and locked_ach_effective == dlc_remaining_effective:
-            dlc_only.append((game, locked_ach_effective))
+    # Roll new unlock days into the progress history store
+    history = ProgressHistory(PROGRESS_HISTORY_PATH)
+    history.update_events(profile.unlock_events())
+    if history.skipped:
+        print(f"Warning: {history.skipped} unlock(s) have an UnlockDate that couldn't be parsed "
+              f"and are missing from {PROGRESS_HISTORY_PATH}", file=sys.stderr)
+    if history.late:
+        print(f"Warning: {history.late} unlock(s) are dated more than {ProgressHistory.REROLL_DAYS} days "
+              f"before the last stored day and are missing from {PROGRESS_HISTORY_PATH}", file=sys.stderr)
+
+    # Export per-game achievement details (only changed games are rewritten)
+    detail_files = export_game_details(profile.listings(), GAME_DETAILS_DIR, history.monthly_by_game())
 
     # Export JSON files for HTML pages
-    export_main_path = Path("main_stats.json")
-    export_dlc_path = Path("dlc_data.json")
-    
-    # Export main stats to JSON
-    export_main_stats(games, ranked, total_games, completed_games, total_gs_earned, total_gs_possible,
-                    total_ta_earned, total_ta_possible, overall_completion_pct, buckets, started_games,
-                    blocked, dlc_only, Path(export_main_path))
-    
-    # Export DLC data to JSON
-    export_dlc_data(games, Path(export_dlc_path))
+    write_json(profile.main_stats(detail_files=detail_files, history=history), Path("main_stats.json"))
+    write_json(profile.dlc_stats(), Path("dlc_data.json"))
 
 
 if __name__ == "__main__":
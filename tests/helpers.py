@@ -0,0 +1,21 @@
+"""Export rows, as csv.DictReader yields them, for the tests."""
+
+
+def _row(game, gs, ta, ratio, dlc, title):
+    ta = gs if ta is None else ta
+    if ratio is None:
+        ratio = round(ta / gs, 2) if gs else ""
+    row = {"GameName": game, "Gamerscore": str(gs), "TAScore": str(ta), "TARatio": str(ratio), "DLCName": dlc}
+    if title is not None:
+        row["AchievementName"] = title
+    return row
+
+
+def unlocked_row(game, gs, ta=None, dlc="", date="2024-01-01", title=None, ratio=None):
+    """An unlocked.csv row. TA defaults to the GS, the ratio to TA / GS."""
+    return dict(_row(game, gs, ta, ratio, dlc, title), UnlockDate=date)
+
+
+def locked_row(game, gs, ta=None, dlc="", unach="", title=None, ratio=None):
+    """A locked.csv row (defaults as unlocked_row)."""
+    return dict(_row(game, gs, ta, ratio, dlc, title), Unachieveable=unach)
@@ -0,0 +1,100 @@
+import unittest
+from rank_next import Catalog, Profile
+from helpers import locked_row, unlocked_row
+
+
+class TestCatalog(unittest.TestCase):
+    def setUp(self):
+        self.unlocked = [unlocked_row("Halo", 10, 20, title="Halo 10"),
+                         unlocked_row("Halo", 20, 40, dlc="Extra", title="Halo 20"),
+                         unlocked_row("Second Extinction", 5, 10, title="SE 5")]
+        self.locked = [locked_row("Halo", 30, 90, title="Halo locked 30"),
+                       locked_row("Halo", 40, 120, dlc="Extra", title="Halo locked 40"),
+                       locked_row("Halo", 50, 150, unach="TRUE", title="Halo locked 50"),
+                       locked_row("Second Extinction", 15, 45, title="SE locked 15")]
+
+    def test_interned_ids_shared_across_profiles(self):
+        catalog = Catalog()
+        a = Profile(self.unlocked, self.locked, catalog=catalog)
+        b = Profile([unlocked_row("Halo", 30, title="Halo locked 30")], [locked_row("Halo", 10, title="Halo 10")],
+                    catalog=catalog)
+        self.assertIsNone(a.unlocked_rows)
+        self.assertEqual(catalog.game_id("Halo"), catalog.game_id("Halo"))
+        self.assertIs(next(iter(a.games())), next(iter(b.games())))
+
+    def test_facts(self):
+        catalog = Catalog()
+        Profile(self.unlocked, self.locked, catalog=catalog)
+        facts = catalog.game_facts("Halo")
+        self.assertEqual((facts["achievements"], facts["gs"], facts["ta"]), (5, 150, 420))
+        self.assertEqual(facts["dlcs"]["Extra"], {"achievements": 2, "gs": 60, "ta": 160})
+        self.assertTrue(catalog.game_facts("Second Extinction")["delisted"])
+        self.assertIsNone(catalog.game_facts("Unknown"))
+
+    def test_matches_uncatalogued_profile(self):
+        plain = Profile(self.unlocked, self.locked)
+        shared = Profile(self.unlocked, self.locked, catalog=Catalog())
+        for kwargs in ({}, {"include_dlc": False}, {"count_unachievable": False}):
+            self.assertEqual(plain.main_stats(**kwargs), shared.main_stats(**kwargs))
+            self.assertEqual(plain.dlc_stats(**kwargs), shared.dlc_stats(**kwargs))
+        self.assertEqual(list(plain.unlock_events()), list(shared.unlock_events()))
+        self.assertEqual(plain.earned_totals(), shared.earned_totals())
+
+    def test_profile_keeps_counters_only(self):
+        profile = Profile(self.unlocked, self.locked, catalog=Catalog())
+        profile.main_stats()
+        halo = profile.games()["Halo"]
+        self.assertNotIn("earned_achievements", halo)
+        self.assertNotIn("locked_achievements_all", halo)
+        self.assertEqual((halo["locked_ach_unach"], halo["locked_gs_unach"]), (1, 50))
+        # listings are rebuilt on demand, never cached
+        listed = profile.listings()["Halo"]
+        self.assertEqual(len(listed["locked_achievements_all"]), 3)
+        self.assertIsNot(profile.listings(), profile.listings())
+        self.assertNotIn("earned_achievements", profile.games()["Halo"])
+
+    def test_independent_of_other_profiles(self):
+        catalog = Catalog()
+        plain = Profile(self.unlocked, self.locked)
+        a = Profile(self.unlocked, self.locked, catalog=catalog)
+        before = a.main_stats()
+        # Another export adds a Halo achievement this profile's export doesn't list
+        Profile([unlocked_row("Halo", 10, title="Halo 10")],
+                [locked_row("Halo", 30, title="Halo locked 30"), locked_row("Halo", 60, title="Halo locked 60")],
+                catalog=catalog)
+        self.assertEqual(a.main_stats(), before)
+        self.assertEqual(a.main_stats(), plain.main_stats())
+        self.assertEqual(a.dlc_stats(), plain.dlc_stats())
+        halo = a.listings()["Halo"]
+        self.assertEqual(sum(x["gamerscore"] for x in halo["locked_achievements_all"]),
+                         a.games()["Halo"]["locked_gs_total"])
+
+    def test_own_ta_values_win(self):
+        catalog = Catalog()
+        Profile(self.unlocked, self.locked, catalog=catalog)
+        # TA values have drifted since the first export was registered
+        rows = [unlocked_row("Halo", 10, 99, title="Halo 10")]
+        locked_rows = [locked_row("Halo", 30, 7, title="Halo locked 30")]
+        plain = Profile(rows, locked_rows)
+        shared = Profile(rows, locked_rows, catalog=catalog)
+        self.assertEqual(shared.earned_totals(), (10, 99))
+        self.assertEqual(shared.earned_totals(), plain.earned_totals())
+        self.assertEqual(shared.main_stats(), plain.main_stats())
+        self.assertEqual(shared.dlc_stats(), plain.dlc_stats())
+        self.assertEqual(list(shared.unlock_events()), list(plain.unlock_events()))
+        self.assertEqual(catalog.game_facts("Halo")["ta"], 420)
+
+    def test_untitled_rows_not_shared(self):
+        catalog = Catalog()
+        Profile([unlocked_row("Halo", 20, 40)], [locked_row("Halo", 20, 60)], catalog=catalog)
+        # A different 20 GS achievement, worth 50 TA
+        rows = [unlocked_row("Halo", 20, 50)]
+        shared = Profile(rows, [], catalog=catalog)
+        self.assertEqual(shared.earned_totals(), (20, 50))
+        self.assertEqual(shared.main_stats(), Profile(rows, []).main_stats())
+        self.assertEqual(shared.listings()["Halo"]["earned_achievements"][0]["ta"], 50)
+        self.assertEqual(catalog.game_facts("Halo")["achievements"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import tempfile
+import unittest
+from pathlib import Path
+from rank_next import build_game_detail, export_game_details
+
+
+def ach(title, ratio, **extra):
+    out = {"title": title, "ratio": ratio, "gamerscore": 10, "ta": 20, "dlc": "", "row": {}}
+    out.update(extra)
+    return out
+
+
+class TestGameDetails(unittest.TestCase):
+    def make_games(self):
+        return {
+            "G": {
+                "earned_achievements": [ach("B", 2.0), ach("A", 1.1)],
+                "locked_achievements_all": [ach("Z", None, unachievable=False),
+                                            ach("Y", 5.0, unachievable=True),
+                                            ach("X", 1.5, unachievable=False)],
+            }
+        }
+
+    def test_sorted_by_ratio(self):
+        detail = build_game_detail("G", self.make_games()["G"])
+        self.assertEqual([a["title"] for a in detail["locked"]], ["X", "Y", "Z"])
+        self.assertEqual([a["title"] for a in detail["earned"]], ["A", "B"])
+        self.assertNotIn("row", detail["earned"][0])
+
+    def test_content_addressed(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            out = Path(tmp) / "game_details"
+            first = export_game_details(self.make_games(), out, root=Path(tmp))
+            self.assertEqual(first, export_game_details(self.make_games(), out, root=Path(tmp)))
+
+            games = self.make_games()
+            games["G"]["earned_achievements"].append(ach("C", 3.0))
+            second = export_game_details(games, out, root=Path(tmp))
+            self.assertNotEqual(first["G"], second["G"])
+            # the superseded file is pruned
+            self.assertEqual(len(list(out.glob("*.json"))), 1)
+
+
+    def test_links_relative_to_root(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            links = export_game_details(self.make_games(), root / "out" / "game_details", root=root)
+            self.assertTrue(links["G"].startswith("out/game_details/"))
+            self.assertTrue((root / links["G"]).exists())
+            with self.assertRaises(ValueError):
+                export_game_details(self.make_games(), root / "game_details", root=root / "out")
+
+
+if __name__ == "__main__":
+    unittest.main()
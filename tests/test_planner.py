@@ -0,0 +1,115 @@
+import itertools
+import random
+import unittest
+from rank_next import CompletionPlanner, FewestAchievementsPlanner, Profile
+from helpers import locked_row, unlocked_row
+
+
+def game(name, ach, gs, ta=0, earned_ach=1, unach_ach=0, unach_gs=0):
+    return {"game": name, "remaining_ach": ach, "remaining_gs": gs, "remaining_ta": ta,
+            "achievable_ach": ach - unach_ach, "achievable_gs": gs - unach_gs, "achievable_ta": ta,
+            "earned_ach": earned_ach}
+
+
+class TestCompletionPlanner(unittest.TestCase):
+    def setUp(self):
+        self.ranked = [game("A", 1, 10, 20), game("B", 2, 100, 150), game("C", 5, 50, 60)]
+
+    def test_prefix_sums(self):
+        p = CompletionPlanner(self.ranked, total_gs_earned=340, total_gs_possible=500)
+        self.assertEqual(p.cum_gs, [0, 10, 110, 160])
+        r = p.after(2)
+        self.assertEqual((r["achievements"], r["gs"], r["ta"]), (3, 110, 170))
+        self.assertAlmostEqual(r["completion_pct"], 90.0)
+        self.assertEqual(p.after(99)["games"], 3)
+
+    def test_targets(self):
+        p = CompletionPlanner(self.ranked, total_gs_earned=340, total_gs_possible=500)
+        self.assertEqual(p.games_for_gs(0), 0)
+        self.assertEqual(p.games_for_gs(11), 2)
+        self.assertIsNone(p.games_for_gs(1000))
+        self.assertEqual(p.games_for_pct(90), 2)
+        self.assertIsNone(p.games_for_pct(101))
+
+    def test_skips_blocked_and_unstarted_games(self):
+        ranked = self.ranked + [game("Blocked", 4, 40, unach_ach=4, unach_gs=40),
+                                game("New", 3, 30, earned_ach=0),
+                                game("Partial", 2, 20, unach_ach=1, unach_gs=15)]
+        p = CompletionPlanner(ranked, 340, 500)
+        self.assertEqual(p.games, ["A", "B", "C", "Partial"])
+        self.assertEqual(p.cum_gs[-1], 165)
+
+
+class TestFewestAchievementsPlanner(unittest.TestCase):
+    def brute_force(self, ranked, gs_gain):
+        best = None
+        for k in range(len(ranked) + 1):
+            for combo in itertools.combinations(ranked, k):
+                if sum(r["achievable_gs"] for r in combo) >= gs_gain:
+                    ach = sum(r["achievable_ach"] for r in combo)
+                    best = ach if best is None else min(best, ach)
+        return best
+
+    def test_small_game_beats_best_ratio(self):
+        ranked = [game("A", 1, 10), game("B", 100, 2000)]
+        p = FewestAchievementsPlanner(ranked, 0, 5000)
+        self.assertEqual(p.for_gs(10)["games"], ["A"])
+        self.assertEqual(p.for_gs(11)["games"], ["B"])
+        plan = p.for_gs(2001)
+        self.assertEqual((plan["games"], plan["achievements"], plan["gs"]), (["A", "B"], 101, 2010))
+        self.assertIsNone(p.for_gs(2011))
+
+    def test_matches_brute_force(self):
+        rng = random.Random(7)
+        for _ in range(30):
+            ranked = [game(f"G{i}", rng.randint(1, 12), rng.randint(1, 20) * 5, unach_ach=rng.choice([0, 0, 1]))
+                      for i in range(rng.randint(1, 7))]
+            p = FewestAchievementsPlanner(ranked, 100, 2000)
+            planned = [r for r in ranked if r["achievable_ach"] > 0]
+            for target in range(0, sum(r["achievable_gs"] for r in planned) + 10, 5):
+                plan = p.for_gs(target)
+                expected = self.brute_force(planned, target)
+                if expected is None:
+                    self.assertIsNone(plan)
+                else:
+                    self.assertEqual(plan["achievements"], expected)
+                    self.assertGreaterEqual(plan["gs"], target)
+
+    def test_pct_target_and_export(self):
+        p = FewestAchievementsPlanner(self.make(), 340, 500)
+        self.assertEqual(p.for_pct(90)["games"], ["A", "B"])
+        self.assertEqual(p.for_pct(100)["achievements"], 8)
+        self.assertIsNone(p.for_pct(101))
+        steps = p.as_dict()
+        self.assertEqual(steps["ach"], [0, 1, 2, 3, 7, 8])
+        self.assertEqual(steps["gs"], [0, 10, 100, 110, 150, 160])
+
+    def make(self):
+        return [game("A", 1, 10, 20), game("B", 2, 100, 150), game("C", 5, 50, 60)]
+
+
+class TestPlannerFromProfile(unittest.TestCase):
+    def test_never_exceeds_full_completion(self):
+        unlocked = [unlocked_row("Halo", 10), unlocked_row("Halo", 40, dlc="Extra"), unlocked_row("Forza", 20)]
+        locked = [locked_row("Halo", 30), locked_row("Forza", 50, unach="1"), locked_row("Forza", 5),
+                  locked_row("Forza", 15, dlc="Extra"), locked_row("Unstarted", 100)]
+        profile = Profile(unlocked, locked)
+        for include_dlc, remaining_gs in ((True, 50), (False, 35)):
+            for count_unachievable in (True, False):
+                p = profile.planner(include_dlc, count_unachievable)
+                self.assertEqual(sorted(p.games), ["Forza", "Halo"])
+                self.assertEqual(p.cum_gs[-1], remaining_gs)
+                fewest = profile.fewest_planner(include_dlc, count_unachievable)
+                self.assertEqual(fewest.best_gs[-1], remaining_gs)
+                for planned in (p.completion_pct[-1], fewest.completion_pct[-1]):
+                    if count_unachievable:
+                        self.assertLess(planned, 100.0)
+                    else:
+                        self.assertEqual(planned, 100.0)
+        # unachievable GS keeps full completion out of reach when it counts
+        self.assertIsNone(profile.planner(count_unachievable=True).games_for_pct(100))
+        self.assertEqual(profile.planner(count_unachievable=False).games_for_pct(100), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import io
+import unittest
+from rank_next import Profile
+from helpers import locked_row
+
+UNLOCKED_CSV = """﻿GameName,Gamerscore,TAScore,TARatio,DLCName,UnlockDate
+Halo,10,15,1.5,,2024-01-02
+Halo,20,60,3.0,Extra,2024-01-05
+Forza,50,55,1.1,,2024-02-10
+"""
+
+LOCKED_ROWS = [
+    locked_row("Halo", 30, 120),
+    locked_row("Halo", 10, 20, dlc="Extra"),
+    locked_row("Forza", 100, 300, unach="1"),
+]
+
+
+class TestProfile(unittest.TestCase):
+    def make_profile(self):
+        return Profile(io.StringIO(UNLOCKED_CSV), LOCKED_ROWS)
+
+    def test_sources_and_summary(self):
+        s = self.make_profile().summary()
+        self.assertEqual(s["total_games"], 2)
+        self.assertEqual(s["total_gs_earned"], 80)
+        self.assertEqual(s["total_gs_possible"], 220)
+
+    def test_settings_are_arguments(self):
+        p = self.make_profile()
+        self.assertEqual([r["game"] for r in p.ranking()], ["Forza", "Halo"])
+        # Excluding unachievable finishes Forza, so it drops out of the ranking
+        self.assertEqual([r["game"] for r in p.ranking(count_unachievable=False)], ["Halo"])
+        self.assertEqual(p.games(include_dlc=False)["Halo"]["earned_ach"], 1)
+        self.assertEqual(p.games()["Halo"]["earned_ach"], 2)
+
+    def test_results_are_cached(self):
+        p = self.make_profile()
+        self.assertIs(p.ranking(), p.ranking())
+        self.assertIs(p.main_stats(), p.main_stats())
+        self.assertIs(p.dlc_stats(), p.dlc_stats())
+        self.assertEqual(p.main_stats()["settings"]["include_dlc"], True)
+
+    def test_missing_columns(self):
+        with self.assertRaises(ValueError):
+            Profile([{"GameName": "Halo"}], LOCKED_ROWS)
+
+
+if __name__ == "__main__":
+    unittest.main()
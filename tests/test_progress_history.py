@@ -0,0 +1,88 @@
+import tempfile
+import unittest
+from pathlib import Path
+from rank_next import parse_unlock_day, ProgressHistory, UnlockDateParser, unlock_events
+from helpers import unlocked_row
+
+
+class TestParseUnlockDay(unittest.TestCase):
+    def test_formats(self):
+        self.assertEqual(parse_unlock_day("2024-03-05 10:11:12"), "2024-03-05")
+        self.assertEqual(parse_unlock_day("05/03/2024 10:11"), "2024-03-05")
+        self.assertEqual(parse_unlock_day("5 Mar 2024"), "2024-03-05")
+        self.assertIsNone(parse_unlock_day(""))
+        self.assertIsNone(parse_unlock_day("not a date"))
+
+    def test_us_and_iso_variants(self):
+        self.assertEqual(parse_unlock_day("03/25/2024"), "2024-03-25")
+        self.assertEqual(parse_unlock_day("2024-03-25T10:00:00Z"), "2024-03-25")
+        self.assertEqual(parse_unlock_day("2024-03-25 10:00:00.123"), "2024-03-25")
+
+    def test_parser_follows_export_format(self):
+        parser = UnlockDateParser(["03/04/2024", "03/25/2024"])
+        # ambiguous, read like the rest of the (US) export
+        self.assertEqual(parser.parse("03/04/2024"), "2024-03-04")
+        self.assertEqual(parser.parse("03/25/2024"), "2024-03-25")
+        self.assertIsNone(parser.parse("garbage"))
+        self.assertIsNone(parser.parse(""))
+        self.assertEqual(parser.skipped, 1)
+
+    def test_ambiguous_date_before_unambiguous_one(self):
+        rows = [unlocked_row("A", 10, 10, date="03/04/2024 10:00"),
+                unlocked_row("A", 5, 5, date="03/25/2024 10:00"),
+                unlocked_row("A", 5, 5, date="03/04/2024")]
+        self.assertEqual([e[0] for e in unlock_events(rows)], ["2024-03-04", "2024-03-25", "2024-03-04"])
+        # without an unambiguous value, dd/mm is assumed
+        self.assertEqual([e[0] for e in unlock_events(rows[:1])], ["2024-04-03"])
+
+
+class TestProgressHistory(unittest.TestCase):
+    def test_incremental_append(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "history.jsonl"
+            rows = [unlocked_row("A", 10, 20, date="2024-01-01"), unlocked_row("B", 5, 5, date="2024-01-02")]
+            self.assertEqual(ProgressHistory(path).update(rows), 2)
+            # Re-running on the same export appends nothing
+            self.assertEqual(ProgressHistory(path).update(rows), 0)
+
+            rows.append(unlocked_row("A", 15, 30, date="2024-01-02"))
+            rows.append(unlocked_row("A", 20, 20, date="2024-02-01"))
+            history = ProgressHistory(path)
+            self.assertEqual(history.update(rows), 2)  # 2024-01-02 superseded + new day
+
+            reloaded = ProgressHistory(path)
+            daily = reloaded.daily_series()
+            self.assertEqual(daily["days"], ["2024-01-01", "2024-01-02", "2024-02-01"])
+            self.assertEqual(daily["gs"], [10, 20, 20])
+            monthly = reloaded.monthly_series()
+            self.assertEqual(monthly["months"], ["2024-01", "2024-02"])
+            self.assertEqual(monthly["ach"], [3, 1])
+            self.assertEqual(reloaded.monthly_by_game()["A"]["gs"], [25, 20])
+
+    def test_skipped_unlocks_are_counted(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            history = ProgressHistory(Path(tmp) / "history.jsonl")
+            rows = [unlocked_row("A", 10, 20, date="2024-01-01"), unlocked_row("A", 5, 5, date="someday"),
+                    unlocked_row("A", 5, 5, date="")]
+            self.assertEqual(history.update(rows), 1)
+            self.assertEqual(history.skipped, 1)
+
+    def test_late_unlocks_in_window_are_rolled_up(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "history.jsonl"
+            rows = [unlocked_row("A", 10, 20, date="2024-01-01"), unlocked_row("A", 5, 5, date="2024-03-10")]
+            ProgressHistory(path).update(rows)
+
+            # A late sync inside the window, one far before it, and a corrected date
+            rows = [unlocked_row("A", 10, 20, date="2024-01-01"), unlocked_row("A", 5, 5, date="2024-03-09"),
+                    unlocked_row("B", 20, 40, date="2024-03-01"), unlocked_row("B", 30, 30, date="2023-06-01")]
+            history = ProgressHistory(path)
+            history.update(rows)
+            self.assertEqual(history.late, 1)
+            daily = ProgressHistory(path).daily_series()
+            self.assertEqual(daily["days"], ["2024-01-01", "2024-03-01", "2024-03-09"])
+            self.assertEqual(daily["gs"], [10, 20, 5])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+from rank_next import RatioStats
+
+
+class TestRatioStats(unittest.TestCase):
+    def test_empty(self):
+        s = RatioStats()
+        self.assertIsNone(s.average())
+        self.assertIsNone(s.median())
+        self.assertEqual(s.summary()["count"], 0)
+
+    def test_running_stats(self):
+        s = RatioStats()
+        for x in (1.0, 2.0, 3.0, 4.0):
+            s.add(x)
+        self.assertEqual(s.count, 4)
+        self.assertAlmostEqual(s.average(), 2.5)
+        self.assertAlmostEqual(s.variance(), 1.25)
+        self.assertEqual((s.min, s.max), (1.0, 4.0))
+
+    def test_quantiles_within_relative_error(self):
+        s = RatioStats()
+        values = [1 + i / 10 for i in range(101)]  # 1.0 .. 11.0
+        for x in values:
+            s.add(x)
+        self.assertAlmostEqual(s.median(), 6.0, delta=6.0 * 0.02)
+        self.assertAlmostEqual(s.p90(), 10.0, delta=10.0 * 0.02)
+
+    def test_merge_matches_single_pass(self):
+        a, b, whole = RatioStats(), RatioStats(), RatioStats()
+        for x in (1.2, 1.5, 2.0):
+            a.add(x)
+            whole.add(x)
+        for x in (3.5, 8.0):
+            b.add(x)
+            whole.add(x)
+        merged = RatioStats.combined(a, b)
+        self.assertEqual(merged.count, whole.count)
+        self.assertAlmostEqual(merged.average(), whole.average())
+        self.assertAlmostEqual(merged.variance(), whole.variance())
+        self.assertEqual(merged.median(), whole.median())
+        self.assertEqual(a.count, 3)  # inputs are left untouched
+
+
+if __name__ == "__main__":
+    unittest.main()